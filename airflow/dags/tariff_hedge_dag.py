@@ -3,7 +3,10 @@ Airflow DAG: tariff-hedge-sim daily pipeline.
 
 Schedule: daily + manual trigger.
 Tasks:
-  generate → ingest_bronze → dbt_run_silver → simulate_risk → dbt_run_gold → generate_alerts
+  generate → ingest_bronze → transform → generate_alerts
+
+transform runs dbt silver → simulate_risk → dbt gold → dbt test in a single
+process (src.pipeline) so Python and dbt start-up is paid once.
 """
 
 from datetime import datetime, timedelta
@@ -12,7 +15,6 @@ from airflow import DAG
 from airflow.operators.bash import BashOperator
 
 PROJECT_DIR = "/opt/airflow/project"
-DBT_DIR = f"{PROJECT_DIR}/dbt_project"
 
 default_args = {
     "owner": "tariff-hedge-sim",
@@ -42,30 +44,9 @@ with DAG(
         bash_command=f"cd {PROJECT_DIR} && python -m src.ingest_bronze",
     )
 
-    dbt_run_silver = BashOperator(
-        task_id="dbt_run_silver",
-        bash_command=(
-            f"cd {DBT_DIR} && dbt run --select staging silver --profiles-dir ."
-        ),
-    )
-
-    simulate_risk = BashOperator(
-        task_id="simulate_risk",
-        bash_command=f"cd {PROJECT_DIR} && python -m src.simulate_risk",
-    )
-
-    dbt_run_gold = BashOperator(
-        task_id="dbt_run_gold",
-        bash_command=(
-            f"cd {DBT_DIR} && dbt run --select gold --profiles-dir ."
-        ),
-    )
-
-    dbt_test = BashOperator(
-        task_id="dbt_test",
-        bash_command=(
-            f"cd {DBT_DIR} && dbt test --profiles-dir ."
-        ),
+    transform = BashOperator(
+        task_id="transform",
+        bash_command=f"cd {PROJECT_DIR} && python -m src.pipeline",
     )
 
     alerts = BashOperator(
@@ -74,4 +55,4 @@ with DAG(
     )
 
     # Task dependencies
-    generate >> ingest_bronze >> dbt_run_silver >> simulate_risk >> dbt_run_gold >> dbt_test >> alerts
+    generate >> ingest_bronze >> transform >> alerts
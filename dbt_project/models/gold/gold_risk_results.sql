@@ -1,7 +1,7 @@
 /*
     Gold layer: risk simulation results joined with invoice metadata.
 
-    Reads the simulation output Parquet and enriches it.
+    Reads the Hive-partitioned simulation output Parquet and enriches it.
     Tracks is_latest per invoice_uuid so we keep history.
 */
 
@@ -10,7 +10,10 @@
 with sim_results as (
 
     select *
-    from read_parquet('../data/silver/simulation_results.parquet')
+    from read_parquet(
+        '../data/silver/simulation_results/run_date=*/*.parquet',
+        hive_partitioning = true
+    )
 
 ),
 
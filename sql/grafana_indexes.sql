@@ -0,0 +1,13 @@
+-- ============================================================
+-- Grafana Dashboard Indexes
+-- Run after the bulk load so each index is built once in bulk
+-- instead of being maintained row by row
+-- ============================================================
+
+ALTER TABLE dashboard.gold_risk_results ADD PRIMARY KEY (invoice_id);
+
+-- Create indexes for faster dashboard queries
+CREATE INDEX idx_gold_updated_at ON dashboard.gold_risk_results(updated_at DESC);
+CREATE INDEX idx_gold_hedge_ratio ON dashboard.gold_risk_results(hedge_ratio);
+CREATE INDEX idx_gold_var_pct ON dashboard.gold_risk_results(var_percentage DESC);
+CREATE INDEX idx_gold_invoice_date ON dashboard.gold_risk_results(invoice_date);
@@ -1,27 +1,60 @@
 """Load and validate project configuration from config.yaml."""
 
 import logging
+from dataclasses import dataclass, fields
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader  # libyaml C parser
+except ImportError:
+    from yaml import SafeLoader
+
 logger = logging.getLogger(__name__)
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 DEFAULT_CONFIG_PATH = PROJECT_ROOT / "config.yaml"
 
 
+@lru_cache(maxsize=4)
+def _load(path_str: str) -> dict[str, Any]:
+    logger.info("Loading config from %s", path_str)
+    with open(path_str, "r") as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+
 def load_config(config_path: Path | None = None) -> dict[str, Any]:
-    """Read config.yaml and return as dict."""
-    path = config_path or DEFAULT_CONFIG_PATH
-    logger.info("Loading config from %s", path)
-    with open(path, "r") as f:
-        cfg = yaml.safe_load(f)
-    return cfg
+    """Read config.yaml and return as dict.
+
+    Parsed configs are cached per resolved path for the life of the process,
+    so callers must treat the returned dict as read-only.
+    """
+    path = Path(config_path or DEFAULT_CONFIG_PATH).resolve()
+    return _load(str(path))
 
 
 def resolve_path(cfg: dict[str, Any], key: str) -> Path:
     """Resolve a relative path from config.paths against project root."""
     rel = cfg["paths"][key]
     return PROJECT_ROOT / rel
+
+
+@dataclass(frozen=True, slots=True)
+class Paths:
+    """Project paths from config.paths, resolved against project root."""
+
+    bronze: Path
+    silver: Path
+    gold: Path
+    alerts: Path
+    tmp: Path
+    warehouse: Path
+
+
+def load_paths(cfg: dict[str, Any] | None = None) -> Paths:
+    """Resolve every configured path once. Loads the default config if cfg is None."""
+    cfg = cfg if cfg is not None else load_config()
+    return Paths(**{f.name: resolve_path(cfg, f.name) for f in fields(Paths)})
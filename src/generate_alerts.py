@@ -7,15 +7,98 @@ suitable for Slack/email/dashboard consumption.
 
 import json
 import logging
-from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
 from pathlib import Path
 
 import duckdb
 
-from src.config_loader import load_config, resolve_path
+try:
+    import orjson  # optional C/SIMD JSON encoder
+except ImportError:
+    orjson = None
+
+from src.config_loader import load_config, load_paths
 
 logger = logging.getLogger(__name__)
 
+# Alert writes are syscall-bound, so threads overlap them despite the GIL
+ALERT_WRITE_WORKERS = 8
+
+# Alert keys, in the same order as the columns projected by ALERTS_QUERY
+ALERT_FIELDS = (
+    "invoice_uuid",
+    "invoice_id",
+    "usd_amount",
+    "invoice_date",
+    "due_date",
+    "horizon_days",
+    "hedged_eur",
+    "var_95_eur",
+    "cvar_95_eur",
+    "var_percentage",
+    "hedge_ratio",
+    "recommendation",
+    "prob_loss_positive",
+    "expected_loss_eur",
+    "prob_loss_gt_10pct",
+    "min_loss",
+    "max_loss",
+    "median_loss",
+    "simulation_timestamp",
+)
+
+# Casts happen inside DuckDB so rows come back as plain Python values; dates and
+# timestamps stay native and are rendered as ISO 8601 when encoded
+ALERTS_QUERY = """
+    SELECT
+        CAST(invoice_uuid AS VARCHAR),
+        CAST(invoice_id AS VARCHAR),
+        CAST(usd_amount AS DOUBLE),
+        invoice_date,
+        due_date,
+        CAST(horizon_days AS INTEGER),
+        CAST(hedged_eur AS DOUBLE),
+        CAST(var_95_eur AS DOUBLE),
+        CAST(cvar_95_eur AS DOUBLE),
+        CAST(var_percentage AS DOUBLE),
+        CAST(hedge_ratio AS DOUBLE),
+        CAST(recommendation AS VARCHAR),
+        CAST(prob_loss_positive AS DOUBLE),
+        CAST(expected_loss_eur AS DOUBLE),
+        CAST(prob_loss_gt_10pct AS DOUBLE),
+        CAST(min_loss AS DOUBLE),
+        CAST(max_loss AS DOUBLE),
+        CAST(median_loss AS DOUBLE),
+        simulation_timestamp
+    FROM gold_risk_results
+    WHERE is_latest = true
+"""
+
+
+def _json_default(value: object) -> str:
+    """Fallback for stdlib json: render dates/timestamps as ISO 8601."""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _encode_alert(alert: dict) -> bytes:
+    """Serialize an alert as compact JSON, using orjson when installed.
+
+    Both encoders write dates and timestamps as ISO 8601 strings.
+    """
+    if orjson is not None:
+        return orjson.dumps(alert)
+    return json.dumps(alert, separators=(",", ":"), default=_json_default).encode()
+
+
+def _write_alert(path_and_alert: tuple[Path, dict]) -> Path:
+    """Write one alert file. Takes a (path, alert) pair so it can be used with pool.map."""
+    path, alert = path_and_alert
+    path.write_bytes(_encode_alert(alert))
+    return path
+
 
 def generate_alerts(run_date: date | None = None, config_path: Path | None = None) -> list[Path]:
     """Read gold results and emit one JSON alert per invoice.
@@ -25,52 +108,30 @@ def generate_alerts(run_date: date | None = None, config_path: Path | None = Non
     cfg = load_config(config_path)
     run_date = run_date or date.today()
 
-    db_path = resolve_path(cfg, "silver").parent / "warehouse.duckdb"
-    con = duckdb.connect(str(db_path), read_only=True)
+    paths = load_paths(cfg)
+
+    con = duckdb.connect(str(paths.warehouse), read_only=True)
 
     try:
-        df = con.execute(
-            "SELECT * FROM gold_risk_results WHERE is_latest = true"
-        ).fetchdf()
+        rows = con.execute(ALERTS_QUERY).fetchall()
     finally:
         con.close()
 
-    if df.empty:
+    if not rows:
         logger.warning("No gold results to generate alerts for")
         return []
 
-    alerts_dir = resolve_path(cfg, "alerts") / run_date.isoformat()
+    alerts_dir = paths.alerts / run_date.isoformat()
     alerts_dir.mkdir(parents=True, exist_ok=True)
 
-    alert_paths = []
-    for _, row in df.iterrows():
-        alert = {
-            "invoice_uuid": row["invoice_uuid"],
-            "invoice_id": row["invoice_id"],
-            "usd_amount": float(row["usd_amount"]),
-            "invoice_date": str(row["invoice_date"]),
-            "due_date": str(row["due_date"]),
-            "horizon_days": int(row["horizon_days"]),
-            "hedged_eur": float(row["hedged_eur"]),
-            "var_95_eur": float(row["var_95_eur"]),
-            "cvar_95_eur": float(row["cvar_95_eur"]),
-            "var_percentage": float(row["var_percentage"]),
-            "hedge_ratio": float(row["hedge_ratio"]),
-            "recommendation": row["recommendation"],
-            "prob_loss_positive": float(row["prob_loss_positive"]),
-            "expected_loss_eur": float(row["expected_loss_eur"]),
-            "prob_loss_gt_10pct": float(row["prob_loss_gt_10pct"]),
-            "min_loss": float(row["min_loss"]),
-            "max_loss": float(row["max_loss"]),
-            "median_loss": float(row["median_loss"]),
-            "simulation_timestamp": str(row["simulation_timestamp"]),
-            "run_date": run_date.isoformat(),
-        }
-
-        alert_path = alerts_dir / f"{row['invoice_uuid']}.json"
-        with open(alert_path, "w") as f:
-            json.dump(alert, f, indent=2)
-        alert_paths.append(alert_path)
+    pending = []
+    for row in rows:
+        alert = dict(zip(ALERT_FIELDS, row))
+        alert["run_date"] = run_date
+        pending.append((alerts_dir / f"{alert['invoice_uuid']}.json", alert))
+
+    with ThreadPoolExecutor(max_workers=ALERT_WRITE_WORKERS) as pool:
+        alert_paths = list(pool.map(_write_alert, pending))
 
     logger.info("Generated %d alerts in %s", len(alert_paths), alerts_dir)
     return alert_paths
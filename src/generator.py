@@ -5,15 +5,16 @@ Each invoice represents a Barcelona olive oil exporter selling to the US in USD.
 Output: CSV written to data/tmp/ for downstream bronze ingestion.
 """
 
-import csv
 import logging
+import os
 import uuid
 from datetime import date, timedelta
 from pathlib import Path
 
 import numpy as np
+import pandas as pd
 
-from src.config_loader import load_config, resolve_path
+from src.config_loader import load_config, load_paths
 
 logger = logging.getLogger(__name__)
 
@@ -28,52 +29,40 @@ def generate_invoices(run_date: date | None = None, config_path: Path | None = N
     run_date = run_date or date.today()
 
     inv_cfg = cfg["invoice"]
-    num_invoices = rng.integers(inv_cfg["min_count"], inv_cfg["max_count"] + 1)
+    num_invoices = int(rng.integers(inv_cfg["min_count"], inv_cfg["max_count"] + 1))
     logger.info("Generating %d invoices for run_date=%s", num_invoices, run_date)
 
-    rows = []
-    for i in range(1, num_invoices + 1):
-        invoice_uuid = str(uuid.uuid4())
-        invoice_id = f"EXP-{run_date:%Y%m%d}-{i:03d}"
-        usd_amount = round(
-            rng.uniform(inv_cfg["usd_amount_min"], inv_cfg["usd_amount_max"]), 2
-        )
-        horizon_days = int(
-            rng.integers(inv_cfg["horizon_days_min"], inv_cfg["horizon_days_max"] + 1)
-        )
-        invoice_date = run_date.isoformat()
-        due_date = (run_date + timedelta(days=horizon_days)).isoformat()
-
-        rows.append(
-            {
-                "invoice_uuid": invoice_uuid,
-                "invoice_id": invoice_id,
-                "usd_amount": usd_amount,
-                "invoice_date": invoice_date,
-                "due_date": due_date,
-                "horizon_days": horizon_days,
-            }
-        )
+    # Draw each column in one RNG call
+    usd_amounts = np.round(
+        rng.uniform(inv_cfg["usd_amount_min"], inv_cfg["usd_amount_max"], num_invoices), 2
+    )
+    horizon_days = rng.integers(
+        inv_cfg["horizon_days_min"], inv_cfg["horizon_days_max"] + 1, num_invoices
+    )
+
+    invoices = pd.DataFrame(
+        {
+            "invoice_uuid": [str(uuid.uuid4()) for _ in range(num_invoices)],
+            "invoice_id": [f"EXP-{run_date:%Y%m%d}-{i:03d}" for i in range(1, num_invoices + 1)],
+            "usd_amount": usd_amounts,
+            "invoice_date": run_date.isoformat(),
+            "due_date": [(run_date + timedelta(days=int(h))).isoformat() for h in horizon_days],
+            "horizon_days": horizon_days,
+        }
+    )
 
     # Write to tmp
-    tmp_dir = resolve_path(cfg, "tmp")
+    tmp_dir = load_paths(cfg).tmp
     tmp_dir.mkdir(parents=True, exist_ok=True)
     out_path = tmp_dir / f"invoices_{run_date}.csv"
 
-    fieldnames = [
-        "invoice_uuid",
-        "invoice_id",
-        "usd_amount",
-        "invoice_date",
-        "due_date",
-        "horizon_days",
-    ]
-    with open(out_path, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
-
-    logger.info("Wrote %d invoices to %s", len(rows), out_path)
+    # Write-then-rename so a rerun creates a new inode instead of rewriting one
+    # that bronze may hardlink to
+    partial_path = out_path.with_suffix(".csv.partial")
+    invoices.to_csv(partial_path, index=False)
+    os.replace(partial_path, out_path)
+
+    logger.info("Wrote %d invoices to %s", len(invoices), out_path)
     return out_path
 
 
@@ -5,15 +5,48 @@ Bronze is append-only and partitioned by run_date.
 Original data is never modified.
 """
 
+import fcntl
 import logging
+import os
 import shutil
 from datetime import date
 from pathlib import Path
 
-from src.config_loader import load_config, resolve_path
+from src.config_loader import load_config, load_paths
 
 logger = logging.getLogger(__name__)
 
+# Linux ioctl for copy-on-write clones (Btrfs, XFS with reflink=1)
+FICLONE = 0x40049409
+
+
+def _fast_copy(src: Path, dst: Path) -> str:
+    """Copy src to dst as cheaply as the filesystem allows.
+
+    Tries a hardlink first, then a reflink clone, then a plain byte copy.
+    A hardlink shares the inode with src, which is safe because the generator
+    replaces the tmp file instead of rewriting it in place.
+    Returns the method used.
+    """
+    dst.unlink(missing_ok=True)
+
+    try:
+        os.link(src, dst)
+        return "hardlink"
+    except OSError:
+        pass
+
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        shutil.copystat(src, dst)
+        return "reflink"
+    except OSError:
+        pass  # cross-device or no reflink support
+
+    shutil.copy2(src, dst)
+    return "copy"
+
 
 def ingest_to_bronze(run_date: date | None = None, config_path: Path | None = None) -> Path:
     """Copy the generated CSV into data/bronze/run_date=YYYY-MM-DD/.
@@ -23,17 +56,19 @@ def ingest_to_bronze(run_date: date | None = None, config_path: Path | None = No
     cfg = load_config(config_path)
     run_date = run_date or date.today()
 
-    tmp_dir = resolve_path(cfg, "tmp")
+    paths = load_paths(cfg)
+
+    tmp_dir = paths.tmp
     src_file = tmp_dir / f"invoices_{run_date}.csv"
     if not src_file.exists():
         raise FileNotFoundError(f"No generated file found at {src_file}")
 
-    bronze_dir = resolve_path(cfg, "bronze") / f"run_date={run_date}"
+    bronze_dir = paths.bronze / f"run_date={run_date}"
     bronze_dir.mkdir(parents=True, exist_ok=True)
     dest_file = bronze_dir / src_file.name
 
-    shutil.copy2(src_file, dest_file)
-    logger.info("Bronze ingested: %s -> %s", src_file, dest_file)
+    method = _fast_copy(src_file, dest_file)
+    logger.info("Bronze ingested (%s): %s -> %s", method, src_file, dest_file)
     return dest_file
 
 
@@ -10,35 +10,54 @@ This script:
 import os
 import sys
 from pathlib import Path
-import yaml
 import duckdb
-import psycopg2
-from psycopg2.extras import execute_batch
-
-
-def load_config():
-    """Load configuration from config.yaml."""
-    config_path = Path(__file__).parent.parent / 'config.yaml'
-    with open(config_path) as f:
-        return yaml.safe_load(f)
+import psycopg
+from psycopg.conninfo import make_conninfo
+
+from src.config_loader import load_paths
+
+SQL_DIR = Path(__file__).parent.parent / 'sql'
+
+# Columns copied from DuckDB gold into Postgres, in table order
+GOLD_COLUMNS = (
+    'invoice_id',
+    'invoice_date',
+    'usd_amount',
+    'hedged_eur',
+    'var_95_eur',
+    'cvar_95_eur',
+    'var_percentage',
+    'hedge_ratio',
+    'prob_loss_gt_10pct',
+    'recommendation',
+)
+
+
+def get_postgres_settings():
+    """Get Postgres connection settings from environment variables or defaults."""
+    # Try environment variables first (from .env)
+    return {
+        'host': os.getenv('POSTGRES_HOST', 'postgres'),  # Docker service name
+        'port': os.getenv('POSTGRES_PORT', '5432'),
+        'dbname': os.getenv('POSTGRES_DB', 'airflow'),
+        'user': os.getenv('POSTGRES_USER', 'airflow'),
+        'password': os.getenv('POSTGRES_PASSWORD', 'airflow'),
+    }
 
 
 def get_postgres_connection():
     """Get Postgres connection using environment variables or defaults."""
-    # Try environment variables first (from .env)
-    host = os.getenv('POSTGRES_HOST', 'postgres')  # Docker service name
-    port = os.getenv('POSTGRES_PORT', '5432')
-    database = os.getenv('POSTGRES_DB', 'airflow')
-    user = os.getenv('POSTGRES_USER', 'airflow')
-    password = os.getenv('POSTGRES_PASSWORD', 'airflow')
+    return psycopg.connect(**get_postgres_settings())
+
+
+def get_postgres_dsn():
+    """Build a libpq key/value connection string for DuckDB's postgres extension."""
+    return make_conninfo(**get_postgres_settings())
+
 
-    return psycopg2.connect(
-        host=host,
-        port=port,
-        database=database,
-        user=user,
-        password=password
-    )
+def sql_literal(text):
+    """Quote text as a DuckDB SQL string literal."""
+    return "'" + text.replace("'", "''") + "'"
 
 
 def load_to_postgres():
@@ -46,17 +65,18 @@ def load_to_postgres():
 
     print("Starting Grafana data load...")
 
-    # Load config
-    config = load_config()
-
     # Connect to DuckDB
-    duckdb_path = Path(config['paths']['warehouse'])
+    duckdb_path = load_paths().warehouse
     if not duckdb_path.exists():
         print(f"ERROR: DuckDB warehouse not found at {duckdb_path}")
         sys.exit(1)
 
+    # In-memory session with the warehouse attached read-only, so Postgres
+    # can be attached writable alongside it
     print(f"Connecting to DuckDB: {duckdb_path}")
-    conn_duck = duckdb.connect(str(duckdb_path), read_only=True)
+    conn_duck = duckdb.connect()
+    conn_duck.execute(f"ATTACH {sql_literal(str(duckdb_path))} AS warehouse (READ_ONLY)")
+    conn_duck.execute("USE warehouse")
 
     # Check if gold table exists
     tables = conn_duck.execute(
@@ -68,68 +88,47 @@ def load_to_postgres():
         conn_duck.close()
         sys.exit(0)  # Exit gracefully
 
-    # Fetch gold data
-    print("Fetching gold data from DuckDB...")
-    df = conn_duck.execute("""
-        SELECT
-            invoice_id,
-            invoice_date,
-            invoice_value_eur,
-            contract_value_usd,
-            hedged_eur,
-            var_95_eur,
-            var_percentage,
-            hedge_ratio,
-            prob_loss_gt_10pct,
-            recommendation
-        FROM gold_risk_results
-    """).fetchdf()
-
-    conn_duck.close()
-
-    if df.empty:
+    num_rows = conn_duck.execute(
+        "SELECT COUNT(*) FROM gold_risk_results WHERE is_latest"
+    ).fetchone()[0]
+    if num_rows == 0:
         print("WARNING: No data in gold_risk_results. Nothing to load.")
+        conn_duck.close()
         sys.exit(0)
 
-    print(f"Fetched {len(df)} invoices from DuckDB")
-
-    # Connect to Postgres
-    print("Connecting to Postgres...")
-    conn_pg = get_postgres_connection()
-    cur = conn_pg.cursor()
-
-    # Create schema and table if not exists
-    print("Creating/verifying Postgres schema...")
-    schema_path = Path(__file__).parent.parent / 'sql' / 'grafana_schema.sql'
-    with open(schema_path) as f:
-        cur.execute(f.read())
-    conn_pg.commit()
-
-    # Truncate and reload (simple full-refresh approach)
-    print("Clearing existing data...")
-    cur.execute("TRUNCATE TABLE dashboard.gold_risk_results")
-
-    # Bulk insert using execute_batch for performance
-    print("Inserting new data...")
-    insert_query = """
-        INSERT INTO dashboard.gold_risk_results (
-            invoice_id, invoice_date, invoice_value_eur, contract_value_usd,
-            hedged_eur, var_95_eur, var_percentage, hedge_ratio,
-            prob_loss_gt_10pct, recommendation
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-    """
-
-    data = [tuple(row) for row in df.values]
-    execute_batch(cur, insert_query, data, page_size=100)
-
-    conn_pg.commit()
-
-    # Verify load
-    cur.execute("SELECT COUNT(*) FROM dashboard.gold_risk_results")
-    count = cur.fetchone()[0]
-
-    cur.close()
-    conn_pg.close()
+    print(f"Found {num_rows} invoices in DuckDB")
+
+    # Engine-to-engine copy: DuckDB streams gold rows straight into Postgres
+    # over the binary COPY protocol, nothing is materialized in Python
+    print("Attaching Postgres to DuckDB...")
+    conn_duck.execute("INSTALL postgres")
+    conn_duck.execute("LOAD postgres")
+    conn_duck.execute(f"ATTACH {sql_literal(get_postgres_dsn())} AS pg (TYPE POSTGRES)")
+
+    table_ddl = (SQL_DIR / 'grafana_schema.sql').read_text()
+    index_ddl = (SQL_DIR / 'grafana_indexes.sql').read_text()
+
+    # Rebuild in one Postgres transaction (simple full-refresh approach):
+    # drop + create the table, bulk-load it, then build indexes once over the
+    # loaded rows. postgres_execute runs on the transaction's own connection.
+    # Gold keeps one row per invoice per simulation run; only the latest one
+    # goes to the dashboard (invoice_id is the Postgres primary key).
+    print("Rebuilding dashboard table...")
+    columns = ', '.join(GOLD_COLUMNS)
+    conn_duck.execute("BEGIN")
+    conn_duck.execute(f"CALL postgres_execute('pg', {sql_literal(table_ddl)})")
+    conn_duck.execute(f"""
+        INSERT INTO pg.dashboard.gold_risk_results ({columns})
+        SELECT {columns} FROM gold_risk_results
+        WHERE is_latest
+    """)
+    conn_duck.execute(f"CALL postgres_execute('pg', {sql_literal(index_ddl)})")
+    conn_duck.execute("COMMIT")
+    conn_duck.close()
+
+    # Verify load from an independent session
+    with get_postgres_connection() as conn_pg:
+        count = conn_pg.execute("SELECT COUNT(*) FROM dashboard.gold_risk_results").fetchone()[0]
 
     print(f"SUCCESS: Loaded {count} invoices into Postgres for Grafana")
     print("Dashboard data is ready at: dashboard.gold_risk_results")
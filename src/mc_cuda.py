@@ -0,0 +1,75 @@
+"""
+CuPy (CUDA) backend for the Monte Carlo risk simulation.
+
+Same batched (invoices × paths) math as the NumPy engine, but sampled and
+reduced on the GPU (fp32 unless simulation.precision is fp64); only the (N,)
+summary arrays are copied back to the host. Worth it for large
+simulation.num_paths (~100k and up).
+
+Selected with `simulation.engine: cuda` in config.yaml.
+"""
+
+import cupy as cp
+import numpy as np
+
+
+def simulate_invoices_cuda(
+    usd_amount: np.ndarray,
+    horizon_days: np.ndarray,
+    seed: int,
+    cfg: dict,
+) -> dict[str, np.ndarray]:
+    """CuPy equivalent of simulate_risk._simulate_invoices. Returns a dict of (N,) host arrays."""
+    fx = cfg["fx"]
+    scenarios = cfg["tariff"]["scenarios"]
+    num_paths = cfg["simulation"]["num_paths"]
+    precision = cfg["simulation"].get("precision", "fp32")
+    if precision not in ("fp32", "fp64"):
+        raise ValueError(f"Unknown simulation precision: {precision!r}")
+    dtype = cp.float64 if precision == "fp64" else cp.float32
+
+    rng = cp.random.default_rng(seed)
+
+    spot = dtype(fx["spot_rate"])
+    forward = dtype(fx["forward_rate"])
+    vol = dtype(fx["annualized_volatility"])
+
+    usd = cp.asarray(usd_amount, dtype=dtype)
+    T = cp.asarray(horizon_days, dtype=dtype) / dtype(365.0)
+    num_invoices = len(usd)
+
+    # Risk-neutral drift so E[S_T] ≈ forward_rate
+    mu = cp.log(forward / spot) / T + (vol**2) / 2
+
+    # GBM terminal values, one row per invoice
+    Z = rng.standard_normal((num_invoices, num_paths), dtype=dtype)
+    S_T = spot * cp.exp(((mu - vol**2 / 2) * T)[:, None] + (vol * cp.sqrt(T))[:, None] * Z)
+
+    # Tariff shock sampling (inverse CDF)
+    shocks = cp.asarray([s["shock"] for s in scenarios], dtype=dtype)
+    cum_probs = cp.asarray(np.cumsum([s["probability"] for s in scenarios]), dtype=dtype)
+    u = rng.random((num_invoices, num_paths), dtype=dtype)
+    shock_idx = cp.minimum(cp.searchsorted(cum_probs, u, side="right"), len(scenarios) - 1)
+
+    unhedged_eur = usd[:, None] * (1 - shocks[shock_idx]) / S_T
+    hedged_eur = usd / forward  # fixed, certain
+    loss_eur = hedged_eur[:, None] - unhedged_eur  # positive = unhedged worse
+
+    cutoff = int(0.05 * num_paths)
+    partitioned = cp.partition(loss_eur, cutoff, axis=1)
+
+    metrics = {
+        "var_95_eur": partitioned[:, cutoff],
+        "cvar_95_eur": partitioned[:, :cutoff].mean(axis=1),
+        "prob_loss_positive": (loss_eur > 0).mean(axis=1),
+        "expected_loss_eur": loss_eur.mean(axis=1),
+        "prob_loss_gt_10pct": (loss_eur > 0.10 * hedged_eur[:, None]).mean(axis=1),
+        "min_loss": loss_eur.min(axis=1),
+        "max_loss": loss_eur.max(axis=1),
+        "median_loss": cp.median(loss_eur, axis=1),
+    }
+    out = {key: cp.asnumpy(value).astype(np.float64) for key, value in metrics.items()}
+
+    # Reported notional stays exact
+    out["hedged_eur"] = np.asarray(usd_amount, dtype=np.float64) / fx["forward_rate"]
+    return out
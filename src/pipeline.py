@@ -0,0 +1,58 @@
+"""
+Transform stage of the pipeline in a single process.
+
+Runs dbt staging + silver → Monte Carlo simulation → dbt gold → dbt test,
+reusing one Python interpreter and one dbtRunner instead of starting a fresh
+process (and re-parsing the dbt project) for every step.
+"""
+
+import contextlib
+import logging
+from datetime import date
+from pathlib import Path
+
+from dbt.adapters.duckdb.connections import DuckDBConnectionManager
+from dbt.cli.main import dbtRunner
+
+from src.config_loader import PROJECT_ROOT
+from src.simulate_risk import run_simulation
+
+logger = logging.getLogger(__name__)
+
+DBT_DIR = PROJECT_ROOT / "dbt_project"
+
+
+def _dbt(runner: dbtRunner, *args: str) -> None:
+    """Invoke a dbt command in-process, raising if it fails."""
+    logger.info("dbt %s", " ".join(args))
+    # Models read data via paths relative to the dbt project directory
+    with contextlib.chdir(DBT_DIR):
+        result = runner.invoke(
+            [*args, "--project-dir", str(DBT_DIR), "--profiles-dir", str(DBT_DIR)]
+        )
+    # dbt-duckdb keeps its read-write warehouse handle open in-process, which
+    # would block the simulation's read-only connection; release it
+    DuckDBConnectionManager.close_all_connections()
+    if not result.success:
+        raise RuntimeError(f"dbt {' '.join(args)} failed") from result.exception
+
+
+def run_pipeline(run_date: date | None = None, config_path: Path | None = None) -> Path:
+    """Build silver, simulate risk, build and test gold.
+
+    Returns path to the simulation output Parquet file.
+    """
+    runner = dbtRunner()
+
+    _dbt(runner, "run", "--select", "staging", "silver")
+    out_path = run_simulation(run_date, config_path)
+    _dbt(runner, "run", "--select", "gold")
+    _dbt(runner, "test")
+
+    return out_path
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    out = run_pipeline()
+    print(f"Pipeline finished, simulation results -> {out}")
@@ -1,13 +1,13 @@
 """
 Monte Carlo risk simulation for FX + tariff exposure.
 
-For each invoice:
+For each invoice (all invoices are simulated as one NumPy batch):
   1. Simulate 10,000 GBM paths for EUR/USD at maturity
   2. Sample tariff shocks per path
   3. Compute unhedged vs hedged EUR outcomes
   4. Calculate VaR, CVaR, and hedge recommendation
 
-Output: Parquet file to data/silver/simulation_results.parquet
+Output: Parquet file under data/silver/simulation_results/run_date=YYYY-MM-DD/
 """
 
 import logging
@@ -16,92 +16,211 @@ from pathlib import Path
 
 import duckdb
 import numpy as np
-import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 
-from src.config_loader import load_config, resolve_path
+from src.config_loader import load_config, load_paths
 
 logger = logging.getLogger(__name__)
 
-
-def _run_simulation_for_invoice(
-    row: dict,
+# simulation.precision → dtype of the per-path arrays
+_SIM_DTYPES = {"fp32": np.float32, "fp64": np.float64}
+
+# Typed Arrow columns: recommendation has only a handful of distinct values
+# (dictionary-encoded); simulation_timestamp and run_date are native
+# fixed-width timestamp[us] (naive, no time zone attached) / date32 rather
+# than ISO strings
+_RESULTS_SCHEMA = pa.schema(
+    [
+        ("invoice_uuid", pa.string()),
+        ("hedged_eur", pa.float64()),
+        ("var_95_eur", pa.float64()),
+        ("cvar_95_eur", pa.float64()),
+        ("var_percentage", pa.float64()),
+        ("hedge_ratio", pa.float64()),
+        ("recommendation", pa.dictionary(pa.int8(), pa.string())),
+        ("prob_loss_positive", pa.float64()),
+        ("expected_loss_eur", pa.float64()),
+        ("prob_loss_gt_10pct", pa.float64()),
+        ("min_loss", pa.float64()),
+        ("max_loss", pa.float64()),
+        ("median_loss", pa.float64()),
+        ("simulation_timestamp", pa.timestamp("us")),
+        ("run_date", pa.date32()),
+    ]
+)
+
+
+def _tariff_distribution(tariff_cfg: dict) -> tuple[np.ndarray, np.ndarray]:
+    """Return tariff shock values and their cumulative probabilities as arrays."""
+    scenarios = tariff_cfg["scenarios"]
+    shocks = np.array([s["shock"] for s in scenarios], dtype=float)
+    cum_probs = np.cumsum([s["probability"] for s in scenarios])
+    return shocks, cum_probs
+
+
+def _simulate_invoices(
+    usd_amount: np.ndarray,
+    horizon_days: np.ndarray,
     rng: np.random.Generator,
     cfg: dict,
-) -> dict:
-    """Run Monte Carlo simulation for a single invoice. Returns a dict of results."""
+) -> dict[str, np.ndarray]:
+    """Run Monte Carlo simulation for all invoices at once.
+
+    Paths are laid out as an (N invoices, P paths) matrix so the whole batch
+    is computed in a handful of NumPy calls. Returns a dict of (N,) arrays.
+    """
     fx = cfg["fx"]
     sim = cfg["simulation"]
     tariff_cfg = cfg["tariff"]
-    hedge_cfg = cfg["hedge"]
 
     spot = fx["spot_rate"]
     forward = fx["forward_rate"]
     vol = fx["annualized_volatility"]
     num_paths = sim["num_paths"]
 
-    usd_amount = row["usd_amount"]
-    horizon_days = row["horizon_days"]
+    # Per-path math runs in fp32 by default: reported metrics are rounded far
+    # above its precision, and it halves memory traffic / doubles SIMD width
+    precision = sim.get("precision", "fp32")
+    if precision not in _SIM_DTYPES:
+        raise ValueError(f"Unknown simulation precision: {precision!r}")
+    dtype = _SIM_DTYPES[precision]
+
+    num_invoices = len(usd_amount)
     T = horizon_days / 365.0
 
     # Risk-neutral drift so E[S_T] ≈ forward_rate
     mu = np.log(forward / spot) / T + (vol**2) / 2
 
-    # GBM terminal values
-    Z = rng.standard_normal(num_paths)
-    S_T = spot * np.exp((mu - vol**2 / 2) * T + vol * np.sqrt(T) * Z)
+    # The kernel runs in place on two preallocated (N, P) buffers instead of
+    # allocating a fresh temporary for every intermediate expression
+    shape = (num_invoices, num_paths)
+    paths = np.empty(shape, dtype=dtype)
+    scratch = np.empty(shape, dtype=dtype)
+
+    # GBM terminal values, one row per invoice: paths holds Z, then S_T
+    rng.standard_normal(dtype=dtype, out=paths)
+    paths *= (vol * np.sqrt(T)).astype(dtype)[:, None]
+    paths += ((mu - vol**2 / 2) * T).astype(dtype)[:, None]
+    np.exp(paths, out=paths)
+    paths *= dtype(spot)
+
+    # Tariff shock sampling (inverse CDF: one uniform per path, vectorized
+    # lookup; mode="clip" keeps float round-off in cum_probs in range)
+    shocks, cum_probs = _tariff_distribution(tariff_cfg)
+    rng.random(dtype=dtype, out=scratch)
+    shock_idx = np.searchsorted(cum_probs.astype(dtype), scratch, side="right")
+    np.take(shocks.astype(dtype), shock_idx, out=scratch, mode="clip")
+
+    # Per-path outcomes: scratch holds shock, then effective USD, then
+    # unhedged EUR, then the loss
+    np.subtract(1, scratch, out=scratch)
+    scratch *= usd_amount.astype(dtype)[:, None]
+    scratch /= paths
+    hedged_eur = usd_amount / forward  # fixed, certain; reported in fp64
+    hedged_col = hedged_eur.astype(dtype)[:, None]
+    loss_eur = np.subtract(hedged_col, scratch, out=scratch)  # positive = unhedged worse
+
+    # Risk metrics: a single O(P) in-place partition (no full sort, no copy)
+    # places the 5% worst losses (most negative) first and the middle order
+    # statistics in place; the remaining metrics do not depend on path order.
+    # Means accumulate in fp64.
+    cutoff = int(0.05 * num_paths)
+    mid = num_paths // 2
+    loss_eur.partition((cutoff, mid - 1, mid), axis=1)
+    tail = loss_eur[:, : cutoff + 1]
+    var_95 = tail[:, cutoff].astype(np.float64)  # 5th percentile
+    cvar_95 = tail[:, :cutoff].mean(axis=1, dtype=np.float64)
+    if num_paths % 2:
+        median_loss = loss_eur[:, mid].astype(np.float64)
+    else:
+        median_loss = (loss_eur[:, mid - 1].astype(np.float64) + loss_eur[:, mid]) / 2
 
-    # Tariff shock sampling
-    probs = [s["probability"] for s in tariff_cfg["scenarios"]]
-    shocks = [s["shock"] for s in tariff_cfg["scenarios"]]
-    shock_indices = rng.choice(len(shocks), size=num_paths, p=probs)
-    shock_values = np.array([shocks[i] for i in shock_indices])
+    return {
+        "hedged_eur": hedged_eur,
+        "var_95_eur": var_95,
+        "cvar_95_eur": cvar_95,
+        "prob_loss_positive": (loss_eur > 0).mean(axis=1),
+        "expected_loss_eur": loss_eur.mean(axis=1, dtype=np.float64),
+        "prob_loss_gt_10pct": (loss_eur > 0.10 * hedged_col).mean(axis=1),
+        "min_loss": loss_eur.min(axis=1).astype(np.float64),
+        "max_loss": loss_eur.max(axis=1).astype(np.float64),
+        "median_loss": median_loss,
+    }
 
-    effective_usd = usd_amount * (1 - shock_values)
 
-    # Per-path outcomes
-    unhedged_eur = effective_usd / S_T
-    hedged_eur = usd_amount / forward  # fixed, certain
-    loss_eur = hedged_eur - unhedged_eur  # positive = unhedged worse
+def _simulate(
+    usd_amount: np.ndarray,
+    horizon_days: np.ndarray,
+    rng: np.random.Generator,
+    cfg: dict,
+) -> dict[str, np.ndarray]:
+    """Dispatch to the Monte Carlo backend selected by simulation.engine."""
+    engine = cfg["simulation"].get("engine", "numpy")
+    if engine == "numpy":
+        return _simulate_invoices(usd_amount, horizon_days, rng, cfg)
+    if engine == "numba":
+        # Imported lazily: numba's import + JIT cost is only paid when selected
+        from src.mc_numba import simulate_invoices_numba
 
-    # Sort losses ascending (worst losses = most negative at start)
-    sorted_losses = np.sort(loss_eur)
+        return simulate_invoices_numba(usd_amount, horizon_days, cfg["random_seed"], cfg)
+    if engine == "cuda":
+        from src.mc_cuda import simulate_invoices_cuda
 
-    # Risk metrics
-    cutoff = int(0.05 * num_paths)
-    var_95 = sorted_losses[cutoff]  # 5th percentile
-    cvar_95 = sorted_losses[:cutoff].mean()
+        return simulate_invoices_cuda(usd_amount, horizon_days, cfg["random_seed"], cfg)
+    if engine == "duckdb":
+        from src.mc_duckdb import simulate_invoices_duckdb
 
-    var_percentage = (var_95 / hedged_eur) * 100
+        return simulate_invoices_duckdb(usd_amount, horizon_days, cfg["random_seed"], cfg)
+    raise ValueError(f"Unknown simulation engine: {engine!r}")
 
-    prob_loss_positive = float((loss_eur > 0).mean())
-    expected_loss = float(loss_eur.mean())
-    prob_loss_gt_10pct = float((loss_eur > 0.10 * hedged_eur).mean())
 
-    # Hedge decision
-    threshold = hedge_cfg["threshold"]
-    max_threshold = hedge_cfg["max_threshold"]
-    hedge_ratio = min(1.0, max(0.0, (var_percentage - threshold) / (max_threshold - threshold)))
+def _hedge_recommendations(var_percentage: np.ndarray, cfg: dict) -> tuple[np.ndarray, list[str]]:
+    """Map VaR% onto a hedge ratio (linear ramp) and a human-readable recommendation."""
+    threshold = cfg["hedge"]["threshold"]
+    max_threshold = cfg["hedge"]["max_threshold"]
+    hedge_ratio = np.clip((var_percentage - threshold) / (max_threshold - threshold), 0.0, 1.0)
 
-    if hedge_ratio == 0:
-        recommendation = "No hedge recommended"
-    else:
-        recommendation = f"Hedge {int(hedge_ratio * 100)}% of the exposure"
+    recommendations = [
+        "No hedge recommended" if ratio == 0 else f"Hedge {int(ratio * 100)}% of the exposure"
+        for ratio in hedge_ratio
+    ]
+    return hedge_ratio, recommendations
 
-    return {
-        "invoice_uuid": row["invoice_uuid"],
-        "hedged_eur": round(hedged_eur, 2),
-        "var_95_eur": round(var_95, 2),
-        "cvar_95_eur": round(cvar_95, 2),
-        "var_percentage": round(var_percentage, 4),
-        "hedge_ratio": round(hedge_ratio, 4),
-        "recommendation": recommendation,
-        "prob_loss_positive": round(prob_loss_positive, 4),
-        "expected_loss_eur": round(expected_loss, 2),
-        "prob_loss_gt_10pct": round(prob_loss_gt_10pct, 4),
-        "min_loss": round(float(sorted_losses[0]), 2),
-        "max_loss": round(float(sorted_losses[-1]), 2),
-        "median_loss": round(float(np.median(loss_eur)), 2),
-    }
+
+def _write_parquet(table: pa.Table, path: Path) -> None:
+    """Write a results table with dictionary encoding and column statistics.
+
+    Statistics let DuckDB skip row groups when dbt scans the dataset.
+    """
+    pq.write_table(table, path, compression="zstd", use_dictionary=True, write_statistics=True)
+
+
+def _migrate_legacy_results(silver_dir: Path) -> None:
+    """Move the old single-file simulation_results.parquet into run_date= partitions.
+
+    Earlier versions appended every run to one file with ISO-string
+    timestamps and dates. Gold only reads the partitioned dataset, so the
+    legacy file is split per run_date, cast to the current schema and then
+    removed. A no-op once migrated.
+    """
+    legacy_path = silver_dir / "simulation_results.parquet"
+    if not legacy_path.is_file():
+        return
+
+    legacy = pq.read_table(legacy_path)
+    for run_date in pc.unique(legacy["run_date"]).to_pylist():
+        part = legacy.filter(pc.equal(legacy["run_date"], run_date))
+        part = part.select(_RESULTS_SCHEMA.names).cast(_RESULTS_SCHEMA)
+
+        part_dir = silver_dir / "simulation_results" / f"run_date={run_date}"
+        part_dir.mkdir(parents=True, exist_ok=True)
+        # Fixed name, so an interrupted migration simply rewrites it next run
+        _write_parquet(part, part_dir / "part-legacy.parquet")
+
+    legacy_path.unlink()
+    logger.info("Migrated %d legacy simulation results from %s", legacy.num_rows, legacy_path)
 
 
 def run_simulation(run_date: date | None = None, config_path: Path | None = None) -> Path:
@@ -110,54 +229,79 @@ def run_simulation(run_date: date | None = None, config_path: Path | None = None
     Returns path to the output Parquet file.
     """
     cfg = load_config(config_path)
+    paths = load_paths(cfg)
     rng = np.random.default_rng(cfg["random_seed"])
     run_date = run_date or date.today()
 
     # Read silver invoices from DuckDB
-    dbt_db_path = resolve_path(cfg, "silver").parent / "warehouse.duckdb"
-    con = duckdb.connect(str(dbt_db_path), read_only=True)
+    con = duckdb.connect(str(paths.warehouse), read_only=True)
 
     try:
-        invoices_df = con.execute(
-            "SELECT * FROM silver_invoices WHERE is_valid = true AND is_latest = true"
-        ).fetchdf()
+        # Only the columns the simulation needs, fetched straight into NumPy
+        invoices = con.execute(
+            """
+            SELECT invoice_uuid, usd_amount, horizon_days
+            FROM silver_invoices
+            WHERE is_valid = true AND is_latest = true
+            """
+        ).fetchnumpy()
     finally:
         con.close()
 
-    if invoices_df.empty:
+    num_invoices = len(invoices["invoice_uuid"])
+    if num_invoices == 0:
         logger.warning("No valid invoices found in silver layer")
         return Path()
 
-    logger.info("Simulating risk for %d invoices", len(invoices_df))
-    sim_timestamp = datetime.utcnow().isoformat()
-
-    results = []
-    for _, row in invoices_df.iterrows():
-        result = _run_simulation_for_invoice(row.to_dict(), rng, cfg)
-        result["simulation_timestamp"] = sim_timestamp
-        result["run_date"] = run_date.isoformat()
-        results.append(result)
-
-    results_df = pd.DataFrame(results)
-
-    # Write to silver (intermediate simulation results consumed by gold dbt model)
-    silver_dir = resolve_path(cfg, "silver")
-    silver_dir.mkdir(parents=True, exist_ok=True)
-    out_path = silver_dir / "simulation_results.parquet"
-
-    # Append to existing results if file exists
-    if out_path.exists():
-        existing = pd.read_parquet(out_path)
-        results_df = pd.concat([existing, results_df], ignore_index=True)
-
-    results_df.to_parquet(out_path, index=False)
-    logger.info("Wrote simulation results to %s (%d rows)", out_path, len(results_df))
+    logger.info("Simulating risk for %d invoices", num_invoices)
+    sim_time = datetime.utcnow()
+
+    metrics = _simulate(
+        np.asarray(invoices["usd_amount"], dtype=float),
+        np.asarray(invoices["horizon_days"], dtype=float),
+        rng,
+        cfg,
+    )
+    var_percentage = (metrics["var_95_eur"] / metrics["hedged_eur"]) * 100
+    hedge_ratio, recommendations = _hedge_recommendations(var_percentage, cfg)
+
+    run_table = pa.table(
+        {
+            "invoice_uuid": invoices["invoice_uuid"],
+            "hedged_eur": metrics["hedged_eur"].round(2),
+            "var_95_eur": metrics["var_95_eur"].round(2),
+            "cvar_95_eur": metrics["cvar_95_eur"].round(2),
+            "var_percentage": var_percentage.round(4),
+            "hedge_ratio": hedge_ratio.round(4),
+            "recommendation": recommendations,
+            "prob_loss_positive": metrics["prob_loss_positive"].round(4),
+            "expected_loss_eur": metrics["expected_loss_eur"].round(2),
+            "prob_loss_gt_10pct": metrics["prob_loss_gt_10pct"].round(4),
+            "min_loss": metrics["min_loss"].round(2),
+            "max_loss": metrics["max_loss"].round(2),
+            "median_loss": metrics["median_loss"].round(2),
+            "simulation_timestamp": np.full(num_invoices, np.datetime64(sim_time, "us")),
+            "run_date": [run_date] * num_invoices,
+        },
+        schema=_RESULTS_SCHEMA,
+    )
+
+    # Write to silver (intermediate simulation results consumed by gold dbt model).
+    # Each run adds one file to a Hive-partitioned dataset, so history is never
+    # rewritten; reruns on the same day get their own file.
+    _migrate_legacy_results(paths.silver)
+    part_dir = paths.silver / "simulation_results" / f"run_date={run_date}"
+    part_dir.mkdir(parents=True, exist_ok=True)
+    out_path = part_dir / f"part-{sim_time:%H%M%S%f}.parquet"
+
+    _write_parquet(run_table, out_path)
+    logger.info("Wrote simulation results to %s (%d rows)", out_path, run_table.num_rows)
 
     # Also write partitioned copy to gold
-    gold_dir = resolve_path(cfg, "gold") / f"run_date={run_date}"
+    gold_dir = paths.gold / f"run_date={run_date}"
     gold_dir.mkdir(parents=True, exist_ok=True)
     gold_path = gold_dir / "simulation_results.parquet"
-    pd.DataFrame(results).to_parquet(gold_path, index=False)
+    _write_parquet(run_table, gold_path)
     logger.info("Wrote gold partition to %s", gold_path)
 
     return out_path